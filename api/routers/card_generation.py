@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, UploadFile, File, Form
 from supabase import Client as SupabaseClient
 from typing import Dict, Any, Optional
-import base64
+import asyncio
 import io
 
 from ..config import (
@@ -115,10 +115,6 @@ async def finalize_card_generation(
         user_image_bytes = await user_image.read()
         log(f"finalize_card_generation: Received user_image.filename: {user_image.filename}, user_image.content_type: {user_image.content_type}", request_id=str(db_id))
 
-        # Convert user_image_bytes to data URL for generate_card_image_bytes
-        user_image_content_type = user_image.content_type or 'image/png'
-        user_image_data_url = f"data:{user_image_content_type};base64,{base64.b64encode(user_image_bytes).decode('utf-8')}"
-
         # Log the received EXIF data
         if photo_date or photo_location or photo_latitude or photo_longitude:
             log(f"Client-side EXIF data for DB ID {db_id}: Date='{photo_date}', Location='{photo_location}', GPS='{photo_latitude},{photo_longitude}'", request_id=str(db_id))
@@ -135,7 +131,7 @@ async def finalize_card_generation(
                 # generate_ai_card_details is expected to return a dict like ColorCardDetails model
                 processed_ai_details = await generate_ai_card_details(
                     hex_color=hex_color,
-                    cropped_image_data_url=user_image_data_url,
+                    user_image_bytes=user_image_bytes,
                     request_id=str(db_id)
                 )
                 log(f"AI details received: {processed_ai_details}", request_id=str(db_id))
@@ -175,28 +171,28 @@ async def finalize_card_generation(
         orientations = ["horizontal", "vertical"]
         
         for orientation in orientations:
-            # Generate PNG version (for web)
-            png_bytes = await generate_card_image_bytes(
-                cropped_image_data_url=user_image_data_url, 
-                card_details=card_details_for_image_gen,
-                hex_color_input=hex_color,
-                orientation=orientation,
-                request_id=str(db_id),
-                photo_date=photo_date,
-                photo_location=photo_location,
-                output_format="PNG"
-            )
-            
-            # Generate TIFF version (for print)
-            tiff_bytes = await generate_card_image_bytes(
-                cropped_image_data_url=user_image_data_url, 
-                card_details=card_details_for_image_gen,
-                hex_color_input=hex_color,
-                orientation=orientation,
-                request_id=str(db_id),
-                photo_date=photo_date,
-                photo_location=photo_location,
-                output_format="TIFF"
+            # Render the PNG (web) and TIFF (print) versions concurrently; each runs in a worker thread
+            png_bytes, tiff_bytes = await asyncio.gather(
+                generate_card_image_bytes(
+                    user_image_bytes=user_image_bytes,
+                    card_details=card_details_for_image_gen,
+                    hex_color_input=hex_color,
+                    orientation=orientation,
+                    request_id=str(db_id),
+                    photo_date=photo_date,
+                    photo_location=photo_location,
+                    output_format="PNG"
+                ),
+                generate_card_image_bytes(
+                    user_image_bytes=user_image_bytes,
+                    card_details=card_details_for_image_gen,
+                    hex_color_input=hex_color,
+                    orientation=orientation,
+                    request_id=str(db_id),
+                    photo_date=photo_date,
+                    photo_location=photo_location,
+                    output_format="TIFF"
+                ),
             )
             
             png_suffix = generate_random_suffix()
@@ -363,28 +359,28 @@ async def add_note_to_card(
         orientations = ["horizontal", "vertical"]
         
         for orientation in orientations:
-            # Generate PNG version (for web)
-            png_bytes = await generate_back_card_image_bytes(
-                note_text=note_text,
-                hex_color_input=hex_color, 
-                orientation=orientation,
-                qr_code_mode=QR_CODE_MODE,
-                extended_id=extended_id,
-                created_at_iso_str=created_at_str, 
-                request_id=str(db_id),
-                output_format="PNG"
-            )
-            
-            # Generate TIFF version (for print)
-            tiff_bytes = await generate_back_card_image_bytes(
-                note_text=note_text,
-                hex_color_input=hex_color, 
-                orientation=orientation,
-                qr_code_mode=QR_CODE_MODE,
-                extended_id=extended_id,
-                created_at_iso_str=created_at_str, 
-                request_id=str(db_id),
-                output_format="TIFF"
+            # Render the PNG (web) and TIFF (print) versions concurrently; each runs in a worker thread
+            png_bytes, tiff_bytes = await asyncio.gather(
+                generate_back_card_image_bytes(
+                    note_text=note_text,
+                    hex_color_input=hex_color, 
+                    orientation=orientation,
+                    qr_code_mode=QR_CODE_MODE,
+                    extended_id=extended_id,
+                    created_at_iso_str=created_at_str, 
+                    request_id=str(db_id),
+                    output_format="PNG"
+                ),
+                generate_back_card_image_bytes(
+                    note_text=note_text,
+                    hex_color_input=hex_color, 
+                    orientation=orientation,
+                    qr_code_mode=QR_CODE_MODE,
+                    extended_id=extended_id,
+                    created_at_iso_str=created_at_str, 
+                    request_id=str(db_id),
+                    output_format="TIFF"
+                ),
             )
             
             png_suffix = generate_random_suffix()
@@ -9,12 +9,12 @@ from typing import Dict, Any, Optional
 
 from api.models.card import ColorCardDetails
 from api.utils.logger import log, info, debug
-from api.utils.image_processor import resize_and_convert_image_for_openai
+from api.utils.image_processor import resize_image_bytes_to_openai_data_url
 from api.utils.response_formatter import OpenAIResponseFormatter
 from api.utils.openai_client import azure_client
 from ..config import AZURE_OPENAI_DEPLOYMENT, AZURE_OPENAI_CLIENT_TIMEOUT
 
-async def generate_ai_card_details(hex_color: str, cropped_image_data_url: str = None, request_id: str = None) -> Dict[str, Any]:
+async def generate_ai_card_details(hex_color: str, user_image_bytes: bytes = None, request_id: str = None) -> Dict[str, Any]:
     """
     Generates AI-based card details using Azure OpenAI.
     
@@ -27,8 +27,8 @@ async def generate_ai_card_details(hex_color: str, cropped_image_data_url: str =
     -----------
     hex_color : str
         The hex color code to use as inspiration (e.g., "#FF5500")
-    cropped_image_data_url : str, optional
-        The cropped image as a data URL (base64 encoded) to be included in the AI prompt
+    user_image_bytes : bytes, optional
+        The raw bytes of the user's cropped image to be included in the AI prompt
     request_id : str, optional
         A unique identifier for logging and tracking the request
         
@@ -45,26 +45,17 @@ async def generate_ai_card_details(hex_color: str, cropped_image_data_url: str =
     -------
     ValueError:
         If the API response is empty/malformed or if the request times out
-        If no image is provided (cropped_image_data_url is None or empty)
+        If no image is provided (user_image_bytes is None or empty)
     Exception:
         For any other errors during API call or processing
     """
     log(f"Starting generate_ai_card_details for hex color: {hex_color}", request_id=request_id)
     
     # Validate image is provided
-    if not cropped_image_data_url:
+    if not user_image_bytes:
         log(f"Error: No cropped image provided for AI generation", level="ERROR", request_id=request_id)
         raise ValueError("A cropped image is required for AI card detail generation")
     
-    # Validate the image data URL format
-    if not cropped_image_data_url.startswith('data:image/'):
-        log(f"Error: Invalid image data URL format: {cropped_image_data_url[:30]}...", level="ERROR", request_id=request_id)
-        raise ValueError("Invalid image data URL format. Must start with 'data:image/'")
-    
-    if ';base64,' not in cropped_image_data_url:
-        log(f"Error: Invalid image data URL format - missing base64 delimiter", level="ERROR", request_id=request_id)
-        raise ValueError("Invalid image data URL format - missing base64 delimiter")
-    
     log(f"Starting Azure OpenAI API call for hex color '{hex_color}' with image. Overall timeout {AZURE_OPENAI_CLIENT_TIMEOUT}s.", request_id=request_id)
     api_call_start_time = time.time()
 
@@ -72,7 +63,8 @@ async def generate_ai_card_details(hex_color: str, cropped_image_data_url: str =
         # Resize and convert the image to 512x512 JPG for OpenAI
         try:
             debug(f"Starting image optimization", request_id=request_id)
-            optimized_image_data_url = resize_and_convert_image_for_openai(cropped_image_data_url, request_id)
+            # Works on the raw upload; only the 512px JPEG is base64-encoded into a data URL
+            optimized_image_data_url = resize_image_bytes_to_openai_data_url(user_image_bytes, request_id)
             debug(f"Image optimization complete", request_id=request_id)
         except ValueError as resize_error:
             log(f"Error resizing image for OpenAI API: {str(resize_error)}", level="ERROR", request_id=request_id)
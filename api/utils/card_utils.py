@@ -1,5 +1,5 @@
 import io
-import base64
+import asyncio
 from typing import Tuple, Dict, Any, Optional
 
 from api.utils.logger import log, debug, error
@@ -7,21 +7,42 @@ from PIL import Image, ImageDraw, ImageFont, ImageOps, ImageCms
 from datetime import datetime
 import os
 import math
+import time
+import functools
 import random
+import unicodedata
 import qrcode
 
-from api.utils.color_utils import hex_to_rgb, rgb_to_cmyk, desaturate_hex_color, adjust_hls
+from api.utils.color_utils import hex_to_rgb
 from api.core.enums import QrCodeMode
 
 # --- Font Loading ---
 ASSETS_BASE_PATH = "assets"
 LOGO_PATH = "public/sf-icon.png"
+ICON_PIN_PATH = "public/icon_pin.png"
+ICON_CALENDAR_PATH = "public/icon_calendar.png"
+
+# --- Card Back Color ---
+FIXED_BACK_CARD_COLOR_HEX = "#e9e9eb"  # "#E9EFF1" # Blue-Grey Card 6
+FIXED_BACK_CARD_RGB = hex_to_rgb(FIXED_BACK_CARD_COLOR_HEX) or (233, 233, 235)  #(233, 237, 241)
+# Text color for the fixed back background (same luminance rule as the front)
+FIXED_BACK_CARD_TEXT_COLOR = (20, 20, 20) if sum(FIXED_BACK_CARD_RGB) > 384 else (255, 255, 255)
 
 # --- Card Dimensions (130mm × 65mm card format) ---
 # PNG dimensions (web quality) - original working values
 CARD_WIDTH_PNG = 700   # Base width for vertical orientation (PNG)
 CARD_HEIGHT_PNG = 1400  # Base height for vertical orientation (PNG)
 
+# --- Web Output Constants ---
+# zlib level for web PNGs: 1 encodes roughly twice as fast as 2 for a few percent more bytes
+PNG_COMPRESS_LEVEL = int(os.environ.get("PNG_COMPRESS_LEVEL", "1"))
+# Formats accepted for the user's photo. The frontend uploads its canvas crop as PNG;
+# pinning the list lets Image.open skip probing every registered plugin.
+# GIF and BMP stay accepted since uploads in those formats have always decoded
+USER_IMAGE_FORMATS = ("PNG", "JPEG", "WEBP", "GIF", "BMP")
+# CARD_PROFILE=1 logs per-stage wall times of the front render at DEBUG (off by default)
+CARD_PROFILE = os.environ.get("CARD_PROFILE") == "1"
+
 # --- Print Quality Constants ---
 PRINT_DPI = 300  # High resolution for professional printing
 MM_TO_INCH = 1 / 25.4  # Exact conversion factor
@@ -129,7 +150,7 @@ def save_card_image(canvas: Image.Image, output_format: str = "PNG", request_id:
             # Create white background
             rgb_image = Image.new('RGB', canvas.size, 'white')
             # Paste RGBA image onto white background using alpha as mask
-            rgb_image.paste(canvas, mask=canvas.split()[-1])
+            rgb_image.paste(canvas, mask=canvas.getchannel("A"))  # one plane, not a four-way split
             canvas = rgb_image
         
         # Save as TIFF with professional print settings, including sRGB color profile
@@ -137,7 +158,7 @@ def save_card_image(canvas: Image.Image, output_format: str = "PNG", request_id:
         canvas.save(
             img_byte_arr, 
             format='TIFF',
-            compression='lzw',  # Lossless compression ideal for print
+            compression='tiff_lzw',  # Lossless compression ideal for print ('lzw' is not a valid Pillow name)
             dpi=(PRINT_DPI, PRINT_DPI),  # Embed 300 DPI metadata
             icc_profile=ImageCms.ImageCmsProfile(srgb_profile).tobytes() # Embed sRGB profile for color consistency
         )
@@ -150,28 +171,34 @@ def save_card_image(canvas: Image.Image, output_format: str = "PNG", request_id:
         canvas.save(
             img_byte_arr, 
             format='PNG', 
-            compress_level=2  # Light compression for web
+            compress_level=PNG_COMPRESS_LEVEL  # Light compression for web
         )
-        debug(f"Saved as PNG with compression level 2", request_id=request_id)
+        debug(f"Saved as PNG with compression level {PNG_COMPRESS_LEVEL}", request_id=request_id)
     
+    # getvalue() returns the BytesIO's own buffer (no copy while nothing else holds a view);
+    # callers upload the result, so it stays bytes rather than a memoryview
     return img_byte_arr.getvalue()
 
-def get_font(size: int, weight: str = "Regular", style: str = "Normal", font_family: str = "Inter", request_id: Optional[str] = None):
-    import os
+# Inter font files present on disk, listed once at import so italic lookups don't stat the filesystem per call
+_INTER_FONT_DIR = os.path.join(ASSETS_BASE_PATH, "fonts", "inter")
+_INTER_FONT_FILES = frozenset(os.listdir(_INTER_FONT_DIR)) if os.path.isdir(_INTER_FONT_DIR) else frozenset()
+
+@functools.lru_cache(maxsize=128)
+def _resolve_font_path(size: int, weight: str, style: str, font_family: str) -> str:
+    """Map a font request to the TTF file that should serve it (memoized; the asset tree is static)."""
     font_style_suffix = "Italic" if style.lower() == "italic" else ""
 
-    font_path = ""
     if font_family == "Mono":
         ibm_plex_weight = "Light" if weight == "Light" else ("Medium" if weight in ["Medium", "Bold", "SemiBold"] else "Regular")
-        font_path = os.path.join(ASSETS_BASE_PATH, "fonts", "mono", f"IBMPlexMono-{ibm_plex_weight}.ttf")
+        return os.path.join(ASSETS_BASE_PATH, "fonts", "mono", f"IBMPlexMono-{ibm_plex_weight}.ttf")
     elif font_family == "Caveat":
-        font_path = os.path.join(ASSETS_BASE_PATH, "fonts", "caveat", f"Caveat-{weight}.ttf") 
+        return os.path.join(ASSETS_BASE_PATH, "fonts", "caveat", f"Caveat-{weight}.ttf") 
     elif font_family == "IBMPlexSerif":
         if weight == "Regular" and style.lower() == "italic":
             serif_font_filename = "IBMPlexSerif-Italic.ttf"
         else:
             serif_font_filename = f"IBMPlexSerif-{weight}{font_style_suffix}.ttf"
-        font_path = os.path.join(ASSETS_BASE_PATH, "fonts", "serif", serif_font_filename)
+        return os.path.join(ASSETS_BASE_PATH, "fonts", "serif", serif_font_filename)
     elif font_family == "Inter":
         pt_suffix = "18pt" if size <= 20 else ("24pt" if size <= 25 else "28pt")
         inter_font_filename = ""
@@ -183,38 +210,48 @@ def get_font(size: int, weight: str = "Regular", style: str = "Normal", font_fam
                 f"Inter_{pt_suffix}-Italic.ttf"
             ]
             for fname_candidate in specific_italic_variations:
-                potential_path = os.path.join(ASSETS_BASE_PATH, "fonts", "inter", fname_candidate)
-                if os.path.exists(potential_path):
+                if fname_candidate in _INTER_FONT_FILES:
                     inter_font_filename = fname_candidate
-                    debug(f"Found specific Inter Italic font: {inter_font_filename}", request_id=request_id)
                     break
             if not inter_font_filename:
                 inter_font_filename = f"Inter_{pt_suffix}-{weight}{font_style_suffix}.ttf"
         else:
             inter_font_filename = f"Inter_{pt_suffix}-{weight}.ttf"
         
-        font_path = os.path.join(ASSETS_BASE_PATH, "fonts", "inter", inter_font_filename)
+        return os.path.join(_INTER_FONT_DIR, inter_font_filename)
     else:
         pt_suffix = "18pt" if size <= 20 else ("24pt" if size <= 25 else "28pt")
-        font_path = os.path.join(ASSETS_BASE_PATH, "fonts", "inter", f"Inter_{pt_suffix}-{weight}{font_style_suffix}.ttf")
+        return os.path.join(_INTER_FONT_DIR, f"Inter_{pt_suffix}-{weight}{font_style_suffix}.ttf")
+
+@functools.lru_cache(maxsize=256)
+def _load_font_cached(font_path: str, size: int):
+    """Parse a TTF once per (path, size); failures raise and are not cached."""
+    font = ImageFont.truetype(font_path, size)
+    debug(f"Loaded font: {font_path} at {size}px")
+    return font
+
+# Generic fallback font, resolved once at import instead of probed on every failed lookup
+_FALLBACK_FONT_PATH = os.path.join(_INTER_FONT_DIR, "Inter-Regular.ttf") if "Inter-Regular.ttf" in _INTER_FONT_FILES else None
+
+@functools.lru_cache(maxsize=64)
+def _fallback_font(size: int):
+    """Inter-Regular when it ships with the assets, otherwise Pillow's built-in font."""
+    if _FALLBACK_FONT_PATH:
+        try:
+            return ImageFont.truetype(_FALLBACK_FONT_PATH, size)
+        except IOError as e:
+            log(f"Inter-Regular fallback failed: {e}. Using ImageFont.load_default().", level="WARNING")
+    return ImageFont.load_default(size)
+
+def get_font(size: int, weight: str = "Regular", style: str = "Normal", font_family: str = "Inter", request_id: Optional[str] = None):
+    font_path = _resolve_font_path(size, weight, style, font_family)
 
     try:
-        loaded_font = ImageFont.truetype(font_path, size)
-        debug(f"Successfully loaded font: {font_path} for family: {font_family}, weight: {weight}, style: {style}", request_id=request_id)
-        return loaded_font
+        # Cache hits are silent; the load itself is logged once in _load_font_cached
+        return _load_font_cached(font_path, size)
     except IOError as e:
         log(f"Failed to load font '{font_path}': {e}. Falling back. (Details: Family='{font_family}', Weight='{weight}', Style='{style}')", level="WARNING", request_id=request_id)
-        try:
-            generic_inter_fallback_path = os.path.join(ASSETS_BASE_PATH, "fonts", "inter", "Inter-Regular.ttf") 
-            if os.path.exists(generic_inter_fallback_path):
-                log(f"Attempting Inter-Regular fallback: {generic_inter_fallback_path}", level="DEBUG", request_id=request_id)
-                return ImageFont.truetype(generic_inter_fallback_path, size)
-            else:
-                log(f"Inter-Regular fallback not found at {generic_inter_fallback_path}. Proceeding to Pillow default.", level="WARNING", request_id=request_id)
-        except IOError as fallback_e:
-            log(f"Inter-Regular fallback also failed: {fallback_e}. Using ImageFont.load_default().", level="WARNING", request_id=request_id)
-        
-        return ImageFont.load_default(size)
+        return _fallback_font(size)
 
 # --- Helper Function for Font Measurements ---
 def get_text_dimensions(text: str, font):
@@ -225,9 +262,199 @@ def get_text_dimensions(text: str, font):
         return font.getsize(text)
     return len(text) * (font.size // 2), font.size # Basic fallback
 
+@functools.lru_cache(maxsize=64)
+def _fixed_text_dimensions(text: str, font):
+    """
+    get_text_dimensions for constant reference strings ("Tg" line heights etc.).
+    Fonts are cached singletons, so (text, font) identifies the result across requests.
+    """
+    return get_text_dimensions(text, font)
+
+def wrap_text_to_width(text: str, font, max_width: float, max_lines: Optional[int] = None) -> list:
+    """
+    Greedy word-wrap of a single paragraph to max_width.
+
+    Each distinct word is measured once and line widths are accumulated, instead
+    of re-measuring the whole growing line for every word. With max_lines set,
+    wrapping stops as soon as that many lines are complete.
+    """
+    space_w = font.getlength(" ")
+    word_widths = {}
+    lines = []
+    line_words = []
+    line_w = 0.0
+    for word in text.split(' '):
+        word_w = word_widths.get(word)
+        if word_w is None:
+            word_w = word_widths[word] = font.getlength(word)
+        candidate_w = line_w + space_w + word_w if line_words else word_w
+        if candidate_w <= max_width or not line_words:
+            line_words.append(word)
+            line_w = candidate_w
+        else:
+            lines.append(" ".join(line_words).strip())
+            if max_lines is not None and len(lines) >= max_lines:
+                return lines
+            line_words = [word]
+            line_w = word_w
+    lines.append(" ".join(line_words).strip())
+    return lines
+
+@functools.lru_cache(maxsize=1024)
+def _glyph_mask(cluster: str, font) -> Tuple[Image.Image, int, int, float]:
+    """
+    Rasterize one glyph cluster once: (L coverage mask, x/y offset of its ink box, advance).
+    Fonts are cached singletons, so (cluster, font) identifies the glyph across cards.
+    """
+    left, top, right, bottom = font.getbbox(cluster)
+    mask = Image.new('L', (max(1, right - left), max(1, bottom - top)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), cluster, font=font, fill=255)
+    return mask, left, top, font.getlength(cluster)
+
+def draw_tracked_text(canvas: Image.Image, xy: tuple, text: str, font, fill, tracking: int) -> float:
+    """
+    Draw text with extra letter-spacing (tracking) after every glyph.
+
+    Each glyph cluster (a base character plus any combining marks) is rasterized once
+    per font and stamped through its cached mask at a running x built from the cached
+    advances plus the tracking. Returns the x just past the last glyph's tracking.
+    """
+    clusters = []
+    for char in text:
+        if clusters and unicodedata.combining(char):
+            clusters[-1] += char  # Keep combining marks with their base so the shaper can place them
+        else:
+            clusters.append(char)
+
+    x, y = xy
+    for cluster in clusters:
+        mask, left, top, advance = _glyph_mask(cluster, font)
+        if not cluster.isspace():
+            canvas.paste(fill, (round(x) + left, round(y) + top), mask)
+        x += advance + tracking
+    return x
+
+# --- Metric Icons ---
+@functools.lru_cache(maxsize=16)
+def _load_tinted_icon(icon_path: str, size: int, color: tuple) -> Image.Image:
+    """Load an icon, resize it and recolor its shape with `color` (alpha preserved)."""
+    icon_alpha = Image.open(icon_path).convert("RGBA").resize((size, size), Image.Resampling.LANCZOS).getchannel("A")
+    tinted_icon = Image.new('RGBA', (size, size), color)
+    tinted_icon.putalpha(icon_alpha)
+    return tinted_icon
+
+def get_tinted_icon(icon_path: str, size: int, color: tuple, request_id: Optional[str] = None) -> Optional[Image.Image]:
+    """Cached tinted icon for the metrics block, or None if it can't be loaded."""
+    if size <= 0:
+        return None
+    try:
+        return _load_tinted_icon(icon_path, size, color)
+    except Exception as e:
+        log(f"Error loading {icon_path}: {e}", level="ERROR", request_id=request_id)
+        return None
+
+# --- Rounded Corner Mask ---
+@functools.lru_cache(maxsize=8)
+def create_rounded_corner_mask(width: int, height: int, radius: int) -> Image.Image:
+    """
+    Build an L-mode alpha mask with anti-aliased rounded corners.
+
+    Only the corners need smoothing, so a single circle is supersampled at 2x,
+    box-reduced once, and its quadrants are pasted into an otherwise solid mask.
+    The result is cached per (width, height, radius) and shared between requests,
+    so callers must treat it as read-only (putalpha only reads it).
+    """
+    mask = Image.new('L', (width, height), 255)
+    if radius <= 0:
+        return mask
+
+    circle = Image.new('L', (radius * 4, radius * 4), 0)
+    ImageDraw.Draw(circle).ellipse([(0, 0), (radius * 4 - 1, radius * 4 - 1)], fill=255)
+    # 2x2 box average: monotonic edge, no LANCZOS ringing to clip
+    circle = circle.reduce(2)
+
+    mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
+    mask.paste(circle.crop((radius, 0, radius * 2, radius)), (width - radius, 0))
+    mask.paste(circle.crop((0, radius, radius, radius * 2)), (0, height - radius))
+    mask.paste(circle.crop((radius, radius, radius * 2, radius * 2)), (width - radius, height - radius))
+    return mask
+
+CARD_CORNER_RADIUS = 40  # px at PNG scale, scaled with the card width
+
+def _card_corner_mask(card_w: int, card_h: int) -> Image.Image:
+    return create_rounded_corner_mask(card_w, card_h, int(CARD_CORNER_RADIUS * (card_w / CARD_WIDTH_PNG)))
+
+def _add_print_passepartout(content_canvas: Image.Image) -> Image.Image:
+    """
+    Composite the rounded RGBA card onto the white passepartout + bleed area in one pass.
+    The result is opaque RGB, so save_card_image has no alpha left to flatten.
+    """
+    offset = PASSEPARTOUT_PX + BLEED_PX
+    final_canvas = Image.new('RGB', (content_canvas.width + 2 * offset, content_canvas.height + 2 * offset), (255, 255, 255))
+    final_canvas.paste(content_canvas, (offset, offset), content_canvas)
+    return final_canvas
+
+# Warm the mask cache for every format/orientation at import so no request pays for it
+for _format in ("PNG", "TIFF"):
+    for _orientation in ("horizontal", "vertical"):
+        _card_corner_mask(*get_card_dimensions(_format, _orientation))
+
+# --- Front Card Profiling ---
+def _profile_lap(label: str, lap_start_ns: int, request_id: Optional[str] = None) -> int:
+    """Logs the time since lap_start_ns under CARD_PROFILE and returns the start of the next lap."""
+    if not CARD_PROFILE:
+        return 0
+    now_ns = time.perf_counter_ns()
+    debug(f"PROFILE {label}: {(now_ns - lap_start_ns) / 1e6:.2f}ms", request_id=request_id)
+    return now_ns
+
+# --- Front Card Layout ---
+@functools.lru_cache(maxsize=8)
+def _get_front_card_layout(output_format: str, orientation: str) -> Dict[str, Any]:
+    """
+    Geometry, paddings and font handles for the card front. They depend only on
+    (output_format, orientation), so they are built once per process and shared;
+    callers must treat the returned dict as read-only.
+    """
+    # Get orientation-specific card dimensions (already correctly oriented)
+    card_w, card_h = get_card_dimensions(output_format, orientation)
+
+    # Calculate layout based on orientation
+    if orientation == "horizontal":
+        # Horizontal: color swatch on left, image on right
+        swatch_w, swatch_h = int(card_w * 0.5), card_h
+        img_panel_w, img_panel_h = card_w - swatch_w, card_h
+        img_paste_pos = (swatch_w, 0)
+    else: # vertical
+        # Vertical: color swatch on top, image on bottom
+        swatch_w, swatch_h = card_w, int(card_h * 0.5)
+        img_panel_w, img_panel_h = card_w, card_h - swatch_h
+        img_paste_pos = (0, swatch_h)
+
+    base_font_scale = swatch_w / CARD_WIDTH_PNG  # Scale relative to PNG baseline for consistent proportions
+
+    return {
+        "card_w": card_w, "card_h": card_h,
+        "swatch_w": swatch_w, "swatch_h": swatch_h,
+        "img_panel_w": img_panel_w, "img_panel_h": img_panel_h,
+        "img_paste_pos": img_paste_pos,
+        "pad_l": int(swatch_w * 0.09),
+        "pad_t": int(swatch_h * 0.02),
+        "pad_b": int(swatch_h * 0.08),
+        "base_font_scale": base_font_scale,
+        # Fonts (Final fine-tuning of base sizes)
+        "f_title": get_font(int(42 * base_font_scale), "Bold"),
+        "f_phonetic": get_font(int(30 * base_font_scale), "Light", "Italic"),
+        "f_article": get_font(int(30 * base_font_scale), "Light"),
+        "f_desc": get_font(int(27 * base_font_scale), "Light"),
+        "f_id": get_font(int(38 * base_font_scale), "Light", font_family="Mono"),
+        "f_brand": get_font(int(40 * base_font_scale), "Bold"),  # User updated
+        "f_metrics_val": get_font(int(26 * base_font_scale), "Light", font_family="Mono"),
+    }
+
 # --- Main Card Generation Logic ---
-async def generate_card_image_bytes(
-    cropped_image_data_url: str,
+def _generate_card_image_bytes_sync(
+    user_image_bytes: bytes,
     card_details: Dict[str, Any],
     hex_color_input: str,
     orientation: str,
@@ -247,83 +474,101 @@ async def generate_card_image_bytes(
         log(f"Invalid hex color for card generation: {hex_color_input}", level="ERROR", request_id=request_id)
         raise ValueError(f"Invalid hex color format: {hex_color_input}")
 
-    # Decode image
-    if ';base64,' not in cropped_image_data_url:
-        log(f"Invalid image data URL format - missing base64 delimiter.", level="ERROR", request_id=request_id)
-        raise ValueError("Invalid image data URL format")
+    # Orientation/format-specific geometry, paddings and fonts (computed once per process)
+    layout = _get_front_card_layout(output_format.upper(), orientation)
+    card_w, card_h = layout["card_w"], layout["card_h"]
+    swatch_w, swatch_h = layout["swatch_w"], layout["swatch_h"]
+    img_panel_w, img_panel_h = layout["img_panel_w"], layout["img_panel_h"]
+    img_paste_pos = layout["img_paste_pos"]
+    
+    profile_lap_start = time.perf_counter_ns() if CARD_PROFILE else 0
+
+    # Decode the uploaded image bytes
     try:
-        header, encoded = cropped_image_data_url.split(';base64,', 1)
-        image_data = base64.b64decode(encoded)
-        img_buffer = io.BytesIO(image_data)
-        user_image_pil = Image.open(img_buffer).convert("RGBA")
+        img_buffer = io.BytesIO(user_image_bytes)
+        user_image_pil = Image.open(img_buffer, formats=USER_IMAGE_FORMATS)
+        # JPEG only (no-op otherwise): let libjpeg scale by 1/2..1/8 while decoding, never
+        # below 2x the panel, which the reduce + LANCZOS passes below bring down anyway
+        user_image_pil.draft('RGB', (img_panel_w * 2, img_panel_h * 2))
+        # Keep alpha only when the source has it: resizing 3 channels is cheaper and needs no paste mask
+        # 'transparency' in info also covers P palettes and tRNS color keys on RGB/L PNGs
+        user_image_has_alpha = user_image_pil.mode in ('RGBA', 'LA', 'PA') or 'transparency' in user_image_pil.info
+        target_mode = "RGBA" if user_image_has_alpha else "RGB"
+        if user_image_pil.mode != target_mode:
+            user_image_pil = user_image_pil.convert(target_mode)
+        else:
+            user_image_pil.load()  # convert() to the same mode would copy every pixel; just decode here so errors surface below
         debug(f"User image decoded. Mode: {user_image_pil.mode}, Size: {user_image_pil.size}", request_id=request_id)
+        profile_lap_start = _profile_lap("image decode", profile_lap_start, request_id)
     except Exception as e:
-        log(f"Error decoding/opening base64 image: {e}", level="ERROR", request_id=request_id)
+        log(f"Error decoding/opening user image: {e}", level="ERROR", request_id=request_id)
         raise ValueError(f"Failed to process image data: {str(e)}")
 
-    # Resize large images
-    if user_image_pil.width > 2000 or user_image_pil.height > 2000:
-        debug(f"Resizing image from {user_image_pil.size} to max 2000px side", request_id=request_id)
-        user_image_pil.thumbnail((2000, 2000), Image.Resampling.LANCZOS)
-        debug(f"Resized image to: {user_image_pil.size}", request_id=request_id)
-
-    # Get orientation-specific card dimensions (already correctly oriented)
-    card_w, card_h = get_card_dimensions(output_format, orientation)
-    bg_color_tuple = (0, 0, 0, 0) # Fully Transparent RGBA
-
-    # Calculate layout based on orientation
-    if orientation == "horizontal":
-        # Horizontal: color swatch on left, image on right
-        swatch_w, swatch_h = int(card_w * 0.5), card_h
-        img_panel_w, img_panel_h = card_w - swatch_w, card_h
-        img_paste_pos = (swatch_w, 0)
-    else: # vertical
-        # Vertical: color swatch on top, image on bottom
-        swatch_w, swatch_h = card_w, int(card_h * 0.5)
-        img_panel_w, img_panel_h = card_w, card_h - swatch_h
-        img_paste_pos = (0, swatch_h)
-    
     log(f"Card dims: {card_w}x{card_h} ({orientation}), Swatch: {swatch_w}x{swatch_h}, ImgPanel: {img_panel_w}x{img_panel_h}", request_id=request_id)
 
-    canvas = Image.new('RGBA', (card_w, card_h), bg_color_tuple)
+    # Start from the swatch color: the image panel covers the rest of the canvas,
+    # so no separate transparent fill + swatch rectangle pass is needed.
+    # Drawing happens in RGB; alpha is only added by the rounded-corner putalpha below.
+    canvas = Image.new('RGB', (card_w, card_h), rgb_color)
     draw = ImageDraw.Draw(canvas)
-    draw.rectangle([(0,0), (swatch_w, swatch_h)], fill=rgb_color)
 
-    # Resize and crop the image to fill the panel
-    user_image_fitted = ImageOps.fit(user_image_pil, (img_panel_w, img_panel_h), Image.Resampling.LANCZOS)
+    # Box-filter oversized images down to no less than 2x the panel first, so the
+    # LANCZOS pass in ImageOps.fit only runs over a few times the output pixels
+    reduce_factor = int(min(user_image_pil.width / img_panel_w, user_image_pil.height / img_panel_h) / 2)
+    if reduce_factor > 1:
+        debug(f"Box-reducing image from {user_image_pil.size} by factor {reduce_factor}", request_id=request_id)
+        # Only the centered region the panel shows is reduced, so the crop happens in
+        # the same pass and the trimmed edges are never averaged
+        src_w, src_h = user_image_pil.size
+        crop_w = min(src_w, round(src_h * img_panel_w / img_panel_h))
+        crop_h = min(src_h, round(src_w * img_panel_h / img_panel_w))
+        crop_left, crop_top = (src_w - crop_w) // 2, (src_h - crop_h) // 2
+        user_image_pil = user_image_pil.reduce(reduce_factor, box=(crop_left, crop_top, crop_left + crop_w, crop_top + crop_h))
+
+    # Resize and crop the image to fill the panel. LANCZOS only pays off for real
+    # downsampling; near-panel-sized (pre-cropped) or upscaled photos use BICUBIC
+    fit_scale = min(user_image_pil.width / img_panel_w, user_image_pil.height / img_panel_h)
+    fit_filter = Image.Resampling.LANCZOS if fit_scale >= 2 else Image.Resampling.BICUBIC
+    if user_image_pil.size == (img_panel_w, img_panel_h):
+        user_image_fitted = user_image_pil  # Already panel-sized: nothing to crop or resample
+    elif abs(user_image_pil.width / user_image_pil.height - img_panel_w / img_panel_h) < 0.01:
+        # Aspect already matches (e.g. frontend square crop): plain resize, no centering crop
+        user_image_fitted = user_image_pil.resize((img_panel_w, img_panel_h), fit_filter)
+    else:
+        user_image_fitted = ImageOps.fit(user_image_pil, (img_panel_w, img_panel_h), fit_filter)
     
     # Paste the fitted image directly at the panel's origin (img_paste_pos)
-    canvas.paste(user_image_fitted, img_paste_pos, user_image_fitted if user_image_fitted.mode == 'RGBA' else None)
+    # Opaque photos are a plain blit; only sources that carry alpha need the masked composite
+    paste_mask = None
+    if user_image_has_alpha:
+        # Transparent photo areas have always rendered black (the card used to start fully
+        # transparent and putalpha dropped the photo's alpha), so composite onto black
+        canvas.paste((0, 0, 0), img_paste_pos + (img_paste_pos[0] + img_panel_w, img_paste_pos[1] + img_panel_h))
+        paste_mask = user_image_fitted
+    canvas.paste(user_image_fitted, img_paste_pos, paste_mask)
 
     debug(f"Image panel size: {img_panel_w}x{img_panel_h}, Fitted image size: {user_image_fitted.width}x{user_image_fitted.height}", request_id=request_id)
     debug(f"Image pasted at: {img_paste_pos}", request_id=request_id)
+    profile_lap_start = _profile_lap("resize + paste", profile_lap_start, request_id)
 
     # Text rendering
     text_color = (20, 20, 20) if sum(rgb_color) > 384 else (245, 245, 245) # 128*3 = 384
-    pad_l = int(swatch_w * 0.09)
-    pad_t = int(swatch_h * 0.02)
-    pad_b = int(swatch_h * 0.08)
-    
-    base_font_scale = swatch_w / CARD_WIDTH_PNG  # Scale relative to PNG baseline for consistent proportions
+    pad_l, pad_t, pad_b = layout["pad_l"], layout["pad_t"], layout["pad_b"]
+    base_font_scale = layout["base_font_scale"]
     current_y = pad_t
 
-    # Fonts (Final fine-tuning of base sizes)
-    f_title = get_font(int(42 * base_font_scale), "Bold", request_id=request_id)
-    f_phonetic = get_font(int(30 * base_font_scale), "Light", "Italic", request_id=request_id)
-    f_article = get_font(int(30 * base_font_scale), "Light", request_id=request_id)
-    f_desc = get_font(int(27 * base_font_scale), "Light", request_id=request_id)
-    f_id = get_font(int(38 * base_font_scale), "Light", font_family="Mono", request_id=request_id)
-    f_brand = get_font(int(40 * base_font_scale), "Bold", request_id=request_id)  # User updated
-    f_metrics_val = get_font(int(26 * base_font_scale), "Light", font_family="Mono", request_id=request_id)
+    f_title = layout["f_title"]
+    f_phonetic = layout["f_phonetic"]
+    f_article = layout["f_article"]
+    f_desc = layout["f_desc"]
+    f_id = layout["f_id"]
+    f_brand = layout["f_brand"]
+    f_metrics_val = layout["f_metrics_val"]
 
     # Color Name (from AI or default)
     color_name_display = card_details.get("colorName", "MISSING NAME").upper()
     current_y += int(swatch_h * 0.07)
-    x_pos = pad_l
-    for char_cn in color_name_display:
-        draw.text((x_pos, current_y), char_cn, font=f_title, fill=text_color)
-        char_w_cn, _ = get_text_dimensions(char_cn, f_title)
-        x_pos += char_w_cn + int(swatch_w * 0.002)
+    draw_tracked_text(canvas, (pad_l, current_y), color_name_display, f_title, text_color, int(swatch_w * 0.002))
     _, h_title = get_text_dimensions(color_name_display, f_title)
     current_y += h_title + int(swatch_h * 0.03)
 
@@ -331,41 +576,29 @@ async def generate_card_image_bytes(
     phonetic_display = card_details.get("phoneticName", "[phonetic]")
     article_display = card_details.get("article", "[article]")
     
-    p_bracket_w, _ = get_text_dimensions("[", f_phonetic)
+    # Brackets sit tight; only the phonetic glyphs between them are tracked out
     draw.text((pad_l, current_y), "[", font=f_phonetic, fill=text_color)
-    x_pos = pad_l + p_bracket_w
-    for char_ph in phonetic_display.strip("[]"):
-        draw.text((x_pos, current_y), char_ph, font=f_phonetic, fill=text_color)
-        char_w_ph, _ = get_text_dimensions(char_ph, f_phonetic)
-        x_pos += char_w_ph + int(swatch_w * 0.005)
+    x_pos = draw_tracked_text(canvas, (pad_l + f_phonetic.getlength("["), current_y), phonetic_display.strip("[]"), f_phonetic, text_color, int(swatch_w * 0.005))
     draw.text((x_pos, current_y), "]", font=f_phonetic, fill=text_color)
-    x_pos += p_bracket_w # Approx for closing bracket
     
-    article_x = x_pos + int(swatch_w * 0.02)
+    article_x = x_pos + f_phonetic.getlength("]") + int(swatch_w * 0.02)
     draw.text((article_x, current_y), article_display, font=f_article, fill=text_color)
     _, h_phonetic = get_text_dimensions(phonetic_display, f_phonetic)
     current_y += h_phonetic + int(swatch_h * 0.05)
 
     # Description
     desc_display = card_details.get("description", "Missing description.")
-    desc_line_h = get_text_dimensions("Tg", f_desc)[1] * 1.08
+    desc_line_h = _fixed_text_dimensions("Tg", f_desc)[1] * 1.08
     max_desc_w = swatch_w - (2 * pad_l)
-    wrapped_desc = []
-    current_line = ""
-    for word in desc_display.split(' '):
-        if get_text_dimensions(current_line + word, f_desc)[0] <= max_desc_w:
-            current_line += word + " "
-        else:
-            wrapped_desc.append(current_line.strip())
-            current_line = word + " "
-    wrapped_desc.append(current_line.strip())
+    max_desc_lines = 5
+    wrapped_desc = wrap_text_to_width(desc_display, f_desc, max_desc_w, max_lines=max_desc_lines)
     
     brand_text = "shadefreude"
     # Get font heights for layout
     _, brand_h = get_text_dimensions(brand_text, f_brand)
-    id_display_for_height_calc = card_details["extendedId"]
-    _, id_h = get_text_dimensions(id_display_for_height_calc, f_id)
-    _, h_new_metric_line = get_text_dimensions("United States", f_metrics_val)
+    id_display = card_details["extendedId"]
+    _, id_h = get_text_dimensions(id_display, f_id)
+    _, h_new_metric_line = _fixed_text_dimensions("United States", f_metrics_val)
 
     # Define vertical spacing
     space_between_brand_id = int(swatch_h * 0.02) # between brand, id AND metrics
@@ -374,9 +607,17 @@ async def generate_card_image_bytes(
 
     # --- Y-Positioning Logic for Bottom Elements (Revised) ---
     # Calculate height of the new metrics block dynamically based on available data
-    num_metric_lines = 0
-    if photo_location: num_metric_lines += 1
-    if photo_date: num_metric_lines += 1
+    # Metric rows (icon, icon size, text) are collected once and reused for drawing below
+    metric_icon_paths, metric_icon_sizes, metric_values = [], [], []
+    if photo_location:
+        metric_icon_paths.append(ICON_PIN_PATH)
+        metric_icon_sizes.append(int(base_font_scale * 20)) # Pin icon size
+        metric_values.append(photo_location)
+    if photo_date:
+        metric_icon_paths.append(ICON_CALENDAR_PATH)
+        metric_icon_sizes.append(int(base_font_scale * 22)) # Calendar icon size
+        metric_values.append(photo_date)
+    num_metric_lines = len(metric_values)
 
     if num_metric_lines > 0:
         total_new_metrics_block_height = (num_metric_lines * h_new_metric_line) + ((num_metric_lines - 1) * line_spacing_new_metrics if num_metric_lines > 1 else 0)
@@ -402,7 +643,7 @@ async def generate_card_image_bytes(
     for i, line_d in enumerate(wrapped_desc):
         # Ensure description does not overlap with the new, higher brand position
         # Adjusted condition to check against brand_y_pos
-        if i < 5 and (current_y + desc_line_h < brand_y_pos - int(swatch_h * 0.04)):
+        if i < max_desc_lines and (current_y + desc_line_h < brand_y_pos - int(swatch_h * 0.04)):
             draw.text((pad_l, current_y), line_d, font=f_desc, fill=text_color)
             current_y += desc_line_h + int(swatch_h * 0.004)
         else: break
@@ -410,118 +651,78 @@ async def generate_card_image_bytes(
     # Draw Brand, ID, Metrics with new Y positions
     draw.text((pad_l, brand_y_pos), brand_text, font=f_brand, fill=text_color)
     
-    id_display = card_details["extendedId"]
     draw.text((pad_l, id_y_pos), id_display, font=f_id, fill=text_color)
 
     # --- New Metrics Rendering (PNG Icon + Text, Dynamic Alignment) ---
-    metric_items_to_render = []
-    if photo_location:
-        metric_items_to_render.append({"type": "pin", "value": photo_location})
-    if photo_date:
-        metric_items_to_render.append({"type": "calendar", "value": photo_date})
+    metric_line_pitch = h_new_metric_line + line_spacing_new_metrics
+    metric_ys = [new_metrics_start_y + i * metric_line_pitch for i in range(len(metric_values))]
 
-    if metric_items_to_render:
-        current_y_for_metric_line = new_metrics_start_y
-        icon_start_x = pad_l
-        
-        # General gap, icon-specific sizes will determine text_start_x in the loop
-        gap_after_icon = int(swatch_w * 0.02)
+    icon_start_x = pad_l
+    # General gap, icon-specific sizes will determine text_start_x in the loop
+    gap_after_icon = int(swatch_w * 0.02)
 
-        # Load icon images once
-        icon_pin_img_orig, icon_calendar_img_orig = None, None
-        try:
-            icon_pin_img_orig = Image.open("public/icon_pin.png").convert("RGBA")
-        except Exception as e:
-            log(f"Error loading public/icon_pin.png: {e}", level="ERROR", request_id=request_id)
-        try:
-            icon_calendar_img_orig = Image.open("public/icon_calendar.png").convert("RGBA")
-        except Exception as e:
-            log(f"Error loading public/icon_calendar.png: {e}", level="ERROR", request_id=request_id)
-
-        for item_info in metric_items_to_render:
-            icon_type = item_info["type"]
-            text_value = item_info["value"]
-            
-            current_icon_image_to_use = None
-            current_icon_size = 0 # Default/placeholder
-
-            if icon_type == "pin" and icon_pin_img_orig:
-                current_icon_image_to_use = icon_pin_img_orig
-                current_icon_size = int(base_font_scale * 20) # Pin icon size
-            elif icon_type == "calendar" and icon_calendar_img_orig:
-                current_icon_image_to_use = icon_calendar_img_orig
-                current_icon_size = int(base_font_scale * 22) # Calendar icon size
-            
-            # Dynamically calculate text_start_x based on current icon size
-            text_start_x = icon_start_x + current_icon_size + gap_after_icon
+    for icon_path, icon_size, text_value, metric_y in zip(metric_icon_paths, metric_icon_sizes, metric_values, metric_ys):
+        tinted_icon = get_tinted_icon(icon_path, icon_size, text_color, request_id=request_id)
+        if tinted_icon is None:
+            icon_size = 0 # Icon failed to load: text starts right after the gap
 
-            # Draw the text first to get its dimensions and position
-            draw.text((text_start_x, current_y_for_metric_line), text_value, font=f_metrics_val, fill=text_color)
-            
+        # Dynamically calculate text_start_x based on current icon size
+        text_start_x = icon_start_x + icon_size + gap_after_icon
+        draw.text((text_start_x, metric_y), text_value, font=f_metrics_val, fill=text_color)
+        
+        if tinted_icon is not None:
             _text_w, text_h = get_text_dimensions(text_value, f_metrics_val)
-            
-            if current_icon_image_to_use and current_icon_size > 0:
-                resized_icon = current_icon_image_to_use.resize((current_icon_size, current_icon_size), Image.Resampling.LANCZOS)
-                icon_paste_y = current_y_for_metric_line + (text_h / 1.0) - (current_icon_size / 1.6)
-                
-                # Create a solid color image with the text_color
-                color_fill_temp = Image.new('RGBA', resized_icon.size, text_color)
-                
-                # Paste the solid color image, using the original resized icon's alpha as the mask
-                # This effectively recolors the icon shape with text_color
-                canvas.paste(color_fill_temp, (icon_start_x, int(icon_paste_y)), resized_icon)
-            
-            current_y_for_metric_line += h_new_metric_line + line_spacing_new_metrics
+            icon_paste_y = metric_y + text_h - (icon_size / 1.6)
+            canvas.paste(tinted_icon, (icon_start_x, int(icon_paste_y)), tinted_icon)
             
     # --- End New Metrics Rendering ---
     
     debug("Text rendering complete", request_id=request_id)
+    profile_lap_start = _profile_lap("text", profile_lap_start, request_id)
 
     # --- Rounded Corners & Passepartout ---
 
     # 1. Apply rounded corners to the content canvas.
     # This makes the content have rounded corners against the passepartout (for TIFFs)
     # or a transparent background (for PNGs).
-    radius = 40
-    scaled_radius = int(radius * (card_w / CARD_WIDTH_PNG))
-    mask = Image.new('L', (card_w * 2, card_h * 2), 0)
-    ImageDraw.Draw(mask).rounded_rectangle([(0,0), (card_w*2-1, card_h*2-1)], radius=scaled_radius*2, fill=255)
-    mask = mask.resize((card_w, card_h), Image.Resampling.LANCZOS)
-    canvas.putalpha(mask)
+    canvas.putalpha(_card_corner_mask(card_w, card_h))
     debug("Applied rounded corners to content canvas", request_id=request_id)
 
     # 2. If TIFF, create passepartout and paste the rounded content onto it.
     if output_format.upper() == 'TIFF':
-        content_canvas = canvas # This now has rounded corners
-        
-        # Step 1: Create card with passepartout (final card size)
-        card_with_passepartout_width = content_canvas.width + (2 * PASSEPARTOUT_PX)
-        card_with_passepartout_height = content_canvas.height + (2 * PASSEPARTOUT_PX)
-        card_with_passepartout = Image.new('RGBA', (card_with_passepartout_width, card_with_passepartout_height), (255, 255, 255, 255))
-        
-        # Paste content onto passepartout
-        passepartout_paste_pos = (PASSEPARTOUT_PX, PASSEPARTOUT_PX)
-        card_with_passepartout.paste(content_canvas, passepartout_paste_pos, content_canvas)
-        
-        # Step 2: Create final TIFF with bleed area
-        final_width = card_with_passepartout.width + (2 * BLEED_PX)
-        final_height = card_with_passepartout.height + (2 * BLEED_PX)
-        final_canvas = Image.new('RGBA', (final_width, final_height), (255, 255, 255, 255))
-        
-        # Paste card with passepartout onto bleed area
-        bleed_paste_pos = (BLEED_PX, BLEED_PX)
-        final_canvas.paste(card_with_passepartout, bleed_paste_pos, card_with_passepartout)
-        
-        canvas = final_canvas # The final image is now content + passepartout + bleed
+        canvas = _add_print_passepartout(canvas)
         debug(f"Added {ACTUAL_PASSEPARTOUT_MM:.2f}mm passepartout + {ACTUAL_BLEED_MM:.2f}mm bleed for TIFF. Final canvas size: {canvas.size} ({canvas.width/PRINT_DPI*25.4:.1f}x{canvas.height/PRINT_DPI*25.4:.1f}mm)", request_id=request_id)
     
+    profile_lap_start = _profile_lap("corners", profile_lap_start, request_id)
+
     # Save card image in requested format (PNG for web, TIFF for print)
     image_bytes = save_card_image(canvas, output_format, request_id)
+    _profile_lap(f"{output_format.upper()} encode", profile_lap_start, request_id)
     log(f"Card image generated ({orientation}, {output_format}). Size: {len(image_bytes)/1024:.2f}KB", request_id=request_id)
     return image_bytes 
 
+async def generate_card_image_bytes(
+    user_image_bytes: bytes,
+    card_details: Dict[str, Any],
+    hex_color_input: str,
+    orientation: str,
+    request_id: Optional[str] = None,
+    photo_date: Optional[str] = None,
+    photo_location: Optional[str] = None,
+    output_format: str = "PNG"
+) -> bytes:
+    """
+    Render the card front in a worker thread so CPU-bound Pillow work doesn't block the event loop.
+    user_image_bytes is the raw image bytes of the upload.
+    """
+    return await asyncio.to_thread(
+        _generate_card_image_bytes_sync,
+        user_image_bytes, card_details, hex_color_input, orientation,
+        request_id, photo_date, photo_location, output_format
+    )
+
 # --- Back Card Generation Logic ---
-async def generate_back_card_image_bytes(
+def _generate_back_card_image_bytes_sync(
     note_text: Optional[str],
     hex_color_input: str, 
     orientation: str,
@@ -537,12 +738,8 @@ async def generate_back_card_image_bytes(
     if output_format.upper() == "TIFF":
         log_print_dimensions(request_id)
 
-    # Define the fixed background color for the card back
-    FIXED_BACK_CARD_COLOR_HEX = "#e9e9eb"  # "#E9EFF1" # Blue-Grey Card 6
-    fixed_back_card_rgb = hex_to_rgb(FIXED_BACK_CARD_COLOR_HEX, request_id=request_id)
-    if not fixed_back_card_rgb:
-        log(f"Failed to convert FIXED_BACK_CARD_COLOR_HEX '{FIXED_BACK_CARD_COLOR_HEX}'. Using fallback.", level="ERROR", request_id=request_id)
-        fixed_back_card_rgb = (233, 233, 235)  #(233, 237, 241)
+    # Fixed background color for the card back (parsed once at import)
+    fixed_back_card_rgb = FIXED_BACK_CARD_RGB
 
     # Get orientation-specific card dimensions (already correctly oriented)
     card_w, card_h = get_card_dimensions(output_format, orientation)
@@ -553,14 +750,14 @@ async def generate_back_card_image_bytes(
 
     # Calculate effective background color
     solid_lightened_bg_rgb = fixed_back_card_rgb # Use the fixed color directly
-    bg_color_tuple = (*solid_lightened_bg_rgb, 255)
 
-    # Initialize Canvas and Draw objects
-    canvas = Image.new('RGBA', (card_w, card_h), bg_color_tuple)
+    # Initialize Canvas and Draw objects. The back is fully opaque until the
+    # rounded-corner putalpha, so it is drawn in RGB like the front
+    canvas = Image.new('RGB', (card_w, card_h), solid_lightened_bg_rgb)
     draw = ImageDraw.Draw(canvas)
 
-    # Determine Text Color (based on the final solid background)
-    text_color = (20, 20, 20) if sum(solid_lightened_bg_rgb) > 384 else (255, 255, 255)
+    # Text color for the fixed background is resolved once at import
+    text_color = FIXED_BACK_CARD_TEXT_COLOR
 
     # Define Paddings and Font Objects
     pad_x = int(card_w * 0.05) 
@@ -579,10 +776,8 @@ async def generate_back_card_image_bytes(
 
     # Draw rectangular stamp background (the actual stamp face)
     stamp_bg_color = (248, 249, 250) # App Background Color (#F8F9FA)
-    draw.rectangle([
-        (stamp_x_start, stamp_y_start), 
-        (stamp_x_start + stamp_width, stamp_y_start + stamp_height)
-    ], fill=stamp_bg_color)
+    # Solid box fill straight into the canvas (box end is exclusive, so +1 keeps the old rectangle's extent)
+    canvas.paste(stamp_bg_color, (stamp_x_start, stamp_y_start, stamp_x_start + stamp_width + 1, stamp_y_start + stamp_height + 1))
 
     # Draw rectangular stamp perforation dots
     perf_reference_size = min(stamp_width, stamp_height)
@@ -596,12 +791,10 @@ async def generate_back_card_image_bytes(
     
     # Draw Logo in rectangular stamp
     try:
-        logo_img_original = Image.open(LOGO_PATH).convert("RGBA")
         # Logo fits within the padded area, scaled by the smaller of stamp_width/stamp_height
         logo_max_dim_w = stamp_width - (2 * stamp_padding_internal)
         logo_max_dim_h = stamp_height - (2 * stamp_padding_internal)
-        logo_img_main = logo_img_original.copy()
-        logo_img_main.thumbnail((logo_max_dim_w, logo_max_dim_h), Image.Resampling.LANCZOS)
+        logo_img_main = _load_stamp_logo(logo_max_dim_w, logo_max_dim_h)
         
         logo_x = stamp_x_start + (stamp_width - logo_img_main.width) // 2 # Centered horizontally
         logo_y = stamp_y_start + (stamp_height - logo_img_main.height) // 2 # Centered vertically
@@ -618,9 +811,10 @@ async def generate_back_card_image_bytes(
     base_postmark_cx = stamp_x_start
     base_postmark_cy = stamp_y_start + stamp_height # Use new stamp_height
 
-    # Create a temporary canvas for the circular postmark to allow rotation
-    # Size needs to be large enough for the rotated postmark (diagonal of its bounding box)
-    temp_canvas_size = int(postmark_diameter * 1.5) # A bit larger to be safe
+    # Create a temporary canvas for the circular postmark to allow rotation.
+    # Everything is drawn inside the circle, which any rotation about the canvas center
+    # maps onto itself, so the canvas only needs the diameter plus an edge margin
+    temp_canvas_size = postmark_diameter + 4
     temp_postmark_canvas = Image.new('RGBA', (temp_canvas_size, temp_canvas_size), (0,0,0,0)) # Transparent background
     temp_draw = ImageDraw.Draw(temp_postmark_canvas)
     temp_cx = temp_canvas_size // 2 # Center of temporary canvas
@@ -641,7 +835,7 @@ async def generate_back_card_image_bytes(
     if created_at_iso_str:
         try:
             dt = datetime.fromisoformat(created_at_iso_str.replace('Z', '+00:00'))
-            pm_date_str = dt.strftime('%Y-%m-%d')
+            pm_date_str = f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
             pm_date_font_size = max(8, int(postmark_radius * 0.28))
             f_pm_date = get_font(pm_date_font_size, weight="Regular", font_family="Inter")
             date_text_w, date_text_h = get_text_dimensions(pm_date_str, f_pm_date)
@@ -650,7 +844,7 @@ async def generate_back_card_image_bytes(
 
     # Random rotation
     random_angle = random.uniform(0, 360)
-    rotated_postmark = temp_postmark_canvas.rotate(random_angle, expand=True, resample=Image.Resampling.BICUBIC)
+    rotated_postmark = temp_postmark_canvas.rotate(random_angle, resample=Image.Resampling.BILINEAR)
 
     # Random position jitter
     max_jitter = postmark_diameter / 4
@@ -677,10 +871,7 @@ async def generate_back_card_image_bytes(
 
             # Draw QR code background (same style as stamp)
             qr_bg_color = stamp_bg_color  # Use same background color as stamp
-            draw.rectangle([
-                (qr_x_start, qr_y_start),
-                (qr_x_start + qr_width, qr_y_start + qr_height)
-            ], fill=qr_bg_color)
+            canvas.paste(qr_bg_color, (qr_x_start, qr_y_start, qr_x_start + qr_width + 1, qr_y_start + qr_height + 1))
 
             # Draw QR code perforation dots (same style as stamp)
             draw_perforation_dots(draw, qr_x_start, qr_y_start, qr_width, qr_height,
@@ -712,7 +903,7 @@ async def generate_back_card_image_bytes(
                 cta_text_color = (20, 20, 20)  # Dark text for readability
                 
                 # Calculate space needed for call-to-action text
-                _, cta_line_height = get_text_dimensions("CREATE", cta_font)
+                _, cta_line_height = _fixed_text_dimensions("CREATE", cta_font)
                 cta_total_height = len(cta_words) * cta_line_height + (len(cta_words) - 1) * int(cta_line_height * 0.1)  # Small line spacing
                 
                 # Reserve space: top for CTA, rest for QR (no URL text)
@@ -761,10 +952,7 @@ async def generate_back_card_image_bytes(
 
                     # Draw QR code background (same style as stamp)
                     qr_bg_color = stamp_bg_color
-                    draw.rectangle([
-                        (qr_x_start, qr_y_start),
-                        (qr_x_start + qr_width, qr_y_start + qr_height)
-                    ], fill=qr_bg_color)
+                    canvas.paste(qr_bg_color, (qr_x_start, qr_y_start, qr_x_start + qr_width + 1, qr_y_start + qr_height + 1))
 
                     # Draw QR code perforation dots (same style as stamp)
                     draw_perforation_dots(draw, qr_x_start, qr_y_start, qr_width, qr_height,
@@ -809,7 +997,6 @@ async def generate_back_card_image_bytes(
     # --- Start of Note and Rule Drawing Logic (Integrate from previous version if needed) ---
     if note_text:
         lines = []
-        max_chars_per_line = int(available_width_for_note / (f_note.size * 0.45)) # Approx char width
         
         # Split note_text into paragraphs first, then wrap each paragraph
         paragraphs = note_text.split('\n')
@@ -818,24 +1005,14 @@ async def generate_back_card_image_bytes(
                 lines.append("") # Add an empty line to preserve paragraph spacing
                 continue
 
-            words = paragraph.split(' ')
-            current_line = ''
-            for word in words:
-                test_line = current_line + word + ' '
-                line_width, _ = get_text_dimensions(test_line.strip(), f_note)
-                if line_width <= available_width_for_note:
-                    current_line = test_line
-                else:
-                    lines.append(current_line.strip())
-                    current_line = word + ' '
-            lines.append(current_line.strip()) # Add the last line of the paragraph
+            lines.extend(wrap_text_to_width(paragraph, f_note, available_width_for_note))
             
         # Remove trailing empty lines that might result from splitting/wrapping
         while lines and not lines[-1]:
             lines.pop()
             
         # Vertical Centering Logic for Text Block and Ruled Lines
-        note_line_h_approx, _ = get_text_dimensions("Tg", f_note) # Height of a single line of text
+        note_line_h_approx, _ = _fixed_text_dimensions("Tg", f_note) # Height of a single line of text
         # Get ascent for more precise vertical alignment to baseline
         try:
             ascent, _ = f_note.getmetrics() # (ascent, descent)
@@ -887,7 +1064,9 @@ async def generate_back_card_image_bytes(
             # Draw the rule line associated with this text line
             # The rule line should be slightly below the text baseline (current_text_baseline_y)
             current_rule_y = current_text_baseline_y + rule_spacing_below_text
-            draw.line([(rule_x_start, current_rule_y), (rule_x_end, current_rule_y)], fill=rule_line_color, width=1)
+            # 1px rule as a solid box fill (same pixels as draw.line, which truncates the y coordinate)
+            rule_y = int(current_rule_y)
+            canvas.paste(rule_line_color, (rule_x_start, rule_y, rule_x_end + 1, rule_y + 1))
             
             y_cursor += single_ruled_line_effective_height # Move to the start of the next line block
 
@@ -897,37 +1076,12 @@ async def generate_back_card_image_bytes(
     # --- Rounded Corners & Passepartout for Back Card ---
 
     # 1. Apply rounded corners to the content canvas.
-    radius = 40
-    scaled_radius = int(radius * (card_w / CARD_WIDTH_PNG))
-    mask = Image.new('L', (card_w * 2, card_h * 2), 0)
-    ImageDraw.Draw(mask).rounded_rectangle([(0,0), (card_w*2-1, card_h*2-1)], radius=scaled_radius*2, fill=255)
-    mask = mask.resize((card_w, card_h), Image.Resampling.LANCZOS)
-    canvas.putalpha(mask)
+    canvas.putalpha(_card_corner_mask(card_w, card_h))
     debug("Applied rounded corners to back content canvas", request_id=request_id)
 
     # 2. If TIFF, create passepartout and paste the rounded content onto it.
     if output_format.upper() == 'TIFF':
-        content_canvas = canvas
-        
-        # Step 1: Create card with passepartout (final card size)
-        card_with_passepartout_width = content_canvas.width + (2 * PASSEPARTOUT_PX)
-        card_with_passepartout_height = content_canvas.height + (2 * PASSEPARTOUT_PX)
-        card_with_passepartout = Image.new('RGBA', (card_with_passepartout_width, card_with_passepartout_height), (255, 255, 255, 255))
-        
-        # Paste content onto passepartout
-        passepartout_paste_pos = (PASSEPARTOUT_PX, PASSEPARTOUT_PX)
-        card_with_passepartout.paste(content_canvas, passepartout_paste_pos, content_canvas)
-        
-        # Step 2: Create final TIFF with bleed area
-        final_width = card_with_passepartout.width + (2 * BLEED_PX)
-        final_height = card_with_passepartout.height + (2 * BLEED_PX)
-        final_canvas = Image.new('RGBA', (final_width, final_height), (255, 255, 255, 255))
-        
-        # Paste card with passepartout onto bleed area
-        bleed_paste_pos = (BLEED_PX, BLEED_PX)
-        final_canvas.paste(card_with_passepartout, bleed_paste_pos, card_with_passepartout)
-        
-        canvas = final_canvas
+        canvas = _add_print_passepartout(canvas)
         debug(f"Added {ACTUAL_PASSEPARTOUT_MM:.2f}mm passepartout + {ACTUAL_BLEED_MM:.2f}mm bleed to back card for TIFF. Final size: {canvas.size} ({canvas.width/PRINT_DPI*25.4:.1f}x{canvas.height/PRINT_DPI*25.4:.1f}mm)", request_id=request_id)
 
     # Save back card image in requested format (PNG for web, TIFF for print)
@@ -935,12 +1089,77 @@ async def generate_back_card_image_bytes(
     log(f"Back card image generated ({orientation}, {output_format}). Size: {len(image_bytes)/1024:.2f}KB", request_id=request_id)
     return image_bytes 
 
+async def generate_back_card_image_bytes(
+    note_text: Optional[str],
+    hex_color_input: str, 
+    orientation: str,
+    qr_code_mode: QrCodeMode,
+    extended_id: Optional[str] = None,
+    created_at_iso_str: Optional[str] = None, 
+    request_id: Optional[str] = None,
+    output_format: str = "PNG"
+) -> bytes:
+    """Render the card back in a worker thread so CPU-bound Pillow work doesn't block the event loop."""
+    return await asyncio.to_thread(
+        _generate_back_card_image_bytes_sync,
+        note_text, hex_color_input, orientation, qr_code_mode,
+        extended_id, created_at_iso_str, request_id, output_format
+    )
+
 # --- Helper Functions for Drawing Postage Elements ---
+@functools.lru_cache(maxsize=1)
+def _load_logo_original() -> Image.Image:
+    """Decode the logo PNG once; every stamp size is thumbnailed from this copy."""
+    with Image.open(LOGO_PATH) as logo_file:
+        return logo_file.convert("RGBA")
+
+@functools.lru_cache(maxsize=4)
+def _load_stamp_logo(max_width: int, max_height: int) -> Image.Image:
+    """Thumbnail the logo to the stamp's inner area, once per stamp size."""
+    logo_img = _load_logo_original().copy()
+    logo_img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+    return logo_img
+
+def _evenly_spaced(length: int, intervals: int, offset: int) -> list:
+    """intervals + 1 positions from 0 to length inclusive, shifted by offset (same values as numpy.linspace)."""
+    step = length / intervals
+    return [i * step + offset for i in range(intervals)] + [length + offset]
+
+@functools.lru_cache(maxsize=16)
+def _perforation_mask(width: int, height: int, perf_dot_radius: int, perf_dot_step: int) -> Image.Image:
+    """
+    Build (once per stamp geometry) an L-mode mask of all perforation dots around a
+    width x height rectangle. The mask origin sits at (-perf_dot_radius, -perf_dot_radius)
+    relative to the rectangle so dots centered on the edges fit entirely.
+    """
+    size = 2 * perf_dot_radius + 1
+    mask = Image.new('L', (width + size, height + size), 0)
+
+    # One row and one column of dots; opposite edges are integer translations of them
+    xs = _evenly_spaced(width, max(1, int(width / perf_dot_step)), perf_dot_radius)
+    ys = _evenly_spaced(height, max(1, int(height / perf_dot_step)), perf_dot_radius)
+    row = Image.new('L', (width + size, size), 0)
+    row_draw = ImageDraw.Draw(row)
+    for px in xs:
+        row_draw.ellipse([(px - perf_dot_radius, 0), (px + perf_dot_radius, 2 * perf_dot_radius)], fill=255)
+    column = Image.new('L', (size, height + size), 0)
+    column_draw = ImageDraw.Draw(column)
+    for py in ys:
+        column_draw.ellipse([(0, py - perf_dot_radius), (2 * perf_dot_radius, py + perf_dot_radius)], fill=255)
+
+    for strip, positions in ((row, ((0, 0), (0, height))), (column, ((0, 0), (width, 0)))):
+        for pos in positions:
+            mask.paste(255, pos, strip)  # strips are 0/255, so masked fill is a union
+    return mask
+
 def draw_perforation_dots(draw, x_start: int, y_start: int, width: int, height: int, 
                          perf_dot_radius: int, perf_dot_step: int, perf_color: tuple):
     """
     Draw perforation dots around a rectangular area (reusable for stamps and QR codes).
     
+    The dot pattern is cached per geometry and stamped onto the image in a single
+    bitmap draw instead of one ellipse call per dot.
+    
     Args:
         draw: PIL ImageDraw object
         x_start, y_start: Top-left corner of the rectangle
@@ -949,22 +1168,8 @@ def draw_perforation_dots(draw, x_start: int, y_start: int, width: int, height:
         perf_dot_step: Distance between perforation dots
         perf_color: Color tuple for the dots
     """
-    edges_coords = [
-        (x_start, y_start, x_start + width, y_start, True),  # Top
-        (x_start, y_start + height, x_start + width, y_start + height, True),  # Bottom
-        (x_start, y_start, x_start, y_start + height, False),  # Left
-        (x_start + width, y_start, x_start + width, y_start + height, False)  # Right
-    ]
-    
-    for x1, y1, x2, y2, is_horiz in edges_coords:
-        length = (x2 - x1) if is_horiz else (y2 - y1)
-        num_dots = max(1, int(length / perf_dot_step))
-        actual_step = length / num_dots if num_dots > 0 else length
-        for i in range(num_dots + 1):
-            curr_pos = i * actual_step
-            px, py = (x1 + curr_pos, y1) if is_horiz else (x1, y1 + curr_pos)
-            draw.ellipse([(px - perf_dot_radius, py - perf_dot_radius), 
-                         (px + perf_dot_radius, py + perf_dot_radius)], fill=perf_color)
+    mask = _perforation_mask(width, height, perf_dot_radius, perf_dot_step)
+    draw.bitmap((x_start - perf_dot_radius, y_start - perf_dot_radius), mask, fill=perf_color)
 
 def generate_qr_code_image(data: str, size: tuple, background_color: tuple = (248, 249, 250), 
                           request_id: Optional[str] = None) -> Image.Image:
@@ -1,30 +1,41 @@
-import re
+import functools
 from typing import Tuple, Optional, List, Dict
-import colorsys # Added for HLS conversions
 
 from api.utils.logger import log
 
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+_HEX_BYTE = tuple(f"{i:02x}" for i in range(256))
+
+@functools.lru_cache(maxsize=1024)
+def _parse_hex_rgb(hex_color: str) -> Optional[Tuple[int, int, int]]:
+    """Pure HEX -> RGB parse, cached so the front/back/print renders of one card share it."""
+    # Explicit digit check: int(..., 16) alone would also accept '0x', signs, '_' and whitespace
+    if len(hex_color) not in (3, 6) or not _HEX_DIGITS.issuperset(hex_color):
+        return None
+
+    n = int(hex_color, 16)
+    if len(hex_color) == 3:
+        return ((n >> 8) & 0xF) * 17, ((n >> 4) & 0xF) * 17, (n & 0xF) * 17
+    return (n >> 16) & 0xFF, (n >> 8) & 0xFF, n & 0xFF
+
 def hex_to_rgb(hex_color: str, request_id: Optional[str] = None) -> Optional[Tuple[int, int, int]]:
     """Converts a HEX color string to an RGB tuple."""
     hex_color = hex_color.lstrip('#')
-    if not re.match(r"^[0-9a-fA-F]{6}$", hex_color) and not re.match(r"^[0-9a-fA-F]{3}$", hex_color):
+    rgb = _parse_hex_rgb(hex_color)
+    if rgb is None:
         log(f"Invalid HEX format: {hex_color}", request_id=request_id)
-        return None 
-    
-    if len(hex_color) == 3:
-        r = int(hex_color[0]*2, 16)
-        g = int(hex_color[1]*2, 16)
-        b = int(hex_color[2]*2, 16)
-    else: # len == 6
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
-    return (r, g, b)
+    return rgb
 
+@functools.lru_cache(maxsize=1024)
 def rgb_to_hex(r: int, g: int, b: int) -> str:
-    """Converts an RGB tuple to a HEX color string."""
-    return f"#{r:02x}{g:02x}{b:02x}"
-
+    """Converts an RGB tuple to a HEX color string. Channels are clamped to 0-255."""
+    # Clamp before the table lookup: negative indices would silently wrap and >255 would raise
+    r = 0 if r < 0 else 255 if r > 255 else r
+    g = 0 if g < 0 else 255 if g > 255 else g
+    b = 0 if b < 0 else 255 if b > 255 else b
+    return "#" + _HEX_BYTE[r] + _HEX_BYTE[g] + _HEX_BYTE[b]
+
+@functools.lru_cache(maxsize=1024)
 def rgb_to_cmyk(r: int, g: int, b: int) -> Tuple[int, int, int, int]:
     """Converts an RGB color (0-255) to CMYK (0-100)."""
     if (r, g, b) == (0, 0, 0):
@@ -75,24 +86,67 @@ def desaturate_hex_color(hex_str: str, amount: float = 0.7, request_id: Optional
     g_desat = int(g + (luminance - g) * amount)
     b_desat = int(b + (luminance - b) * amount)
     
-    # Ensure values are within 0-255 range
-    r_desat = max(0, min(255, r_desat))
-    g_desat = max(0, min(255, g_desat))
-    b_desat = max(0, min(255, b_desat))
+    # Ensure values are within 0-255 range (conditional expressions skip the min/max calls)
+    r_desat = 0 if r_desat < 0 else 255 if r_desat > 255 else r_desat
+    g_desat = 0 if g_desat < 0 else 255 if g_desat > 255 else g_desat
+    b_desat = 0 if b_desat < 0 else 255 if b_desat > 255 else b_desat
     
     return (r_desat, g_desat, b_desat) 
 
 # --- HLS based color manipulations ---
 
+# colorsys.rgb_to_hls / hls_to_rgb inlined (same float operations, so identical results)
+# to skip the extra calls and max()/min() builtins per channel
+_ONE_THIRD = 1.0 / 3.0
+_ONE_SIXTH = 1.0 / 6.0
+_TWO_THIRD = 2.0 / 3.0
+
 def _rgb_to_hls(r: int, g: int, b: int) -> Tuple[float, float, float]:
     """Converts RGB (0-255) to HLS (0-1 for all components)."""
-    return colorsys.rgb_to_hls(r / 255.0, g / 255.0, b / 255.0)
+    rf, gf, bf = r / 255.0, g / 255.0, b / 255.0
+    maxc = rf if rf > gf else gf
+    maxc = maxc if maxc > bf else bf
+    minc = rf if rf < gf else gf
+    minc = minc if minc < bf else bf
+    sumc = maxc + minc
+    l = sumc / 2.0
+    if minc == maxc:
+        return 0.0, l, 0.0
+    rangec = maxc - minc
+    s = rangec / sumc if l <= 0.5 else rangec / (2.0 - maxc - minc)
+    rc = (maxc - rf) / rangec
+    gc = (maxc - gf) / rangec
+    bc = (maxc - bf) / rangec
+    if rf == maxc:
+        h = bc - gc
+    elif gf == maxc:
+        h = 2.0 + rc - bc
+    else:
+        h = 4.0 + gc - rc
+    return (h / 6.0) % 1.0, l, s
+
+def _hue_to_channel(m1: float, m2: float, hue: float) -> float:
+    hue = hue % 1.0
+    if hue < _ONE_SIXTH:
+        return m1 + (m2 - m1) * hue * 6.0
+    if hue < 0.5:
+        return m2
+    if hue < _TWO_THIRD:
+        return m1 + (m2 - m1) * (_TWO_THIRD - hue) * 6.0
+    return m1
 
 def _hls_to_rgb(h: float, l: float, s: float) -> Tuple[int, int, int]:
     """Converts HLS (0-1 for all components) to RGB (0-255)."""
-    r, g, b = colorsys.hls_to_rgb(h, l, s)
-    return (round(r * 255), round(g * 255), round(b * 255))
-
+    if s == 0.0:
+        v = round(l * 255)
+        return (v, v, v)
+    m2 = l * (1.0 + s) if l <= 0.5 else l + s - (l * s)
+    m1 = 2.0 * l - m2
+    return (round(_hue_to_channel(m1, m2, h + _ONE_THIRD) * 255),
+            round(_hue_to_channel(m1, m2, h) * 255),
+            round(_hue_to_channel(m1, m2, h - _ONE_THIRD) * 255))
+
+@functools.lru_cache(maxsize=4096)
 def adjust_hls(rgb: Tuple[int, int, int], h_offset_deg: float = 0, l_factor: float = 1.0, s_factor: float = 1.0) -> Tuple[int, int, int]:
     """
     Adjusts Hue, Lightness, and Saturation of an RGB color.
@@ -155,10 +209,16 @@ def generate_color_variations(hex_color: str, request_id: Optional[str] = None)
         log(f"Invalid hex color for variations: {hex_color}", level="ERROR", request_id=request_id)
         return []
 
+    # Fresh dicts per call so callers can't mutate the cached palette
+    return [{"name": name, "hex": hex_str} for name, hex_str in _generate_variations_cached(original_rgb)]
+
+@functools.lru_cache(maxsize=1024)
+def _generate_variations_cached(original_rgb: Tuple[int, int, int]) -> Tuple[Tuple[str, str], ...]:
+    """(name, hex) pairs for generate_color_variations, computed once per base color."""
     variations = []
     
     # Add original color as the first option
-    variations.append({"name": "Original", "hex": rgb_to_hex(*original_rgb)})
+    variations.append(("Original", rgb_to_hex(*original_rgb)))
 
     # Generate variations from the proposals, ensuring we get up to 19 more to make 20 total
     for proposal in COLOR_VARIATION_PROPOSALS[:19]: # Ensure we don't exceed 20 total with Original
@@ -169,10 +229,10 @@ def generate_color_variations(hex_color: str, request_id: Optional[str] = None)
         
         try:
             adjusted_rgb = adjust_hls(original_rgb, h_offset_deg=h_offset_deg, l_factor=l_factor, s_factor=s_factor)
-            variations.append({"name": name, "hex": rgb_to_hex(*adjusted_rgb)})
+            variations.append((name, rgb_to_hex(*adjusted_rgb)))
         except Exception as e:
-            log(f"Error generating variation '{name}' for {hex_color}: {e}", level="WARNING", request_id=request_id)
+            log(f"Error generating variation '{name}' for {rgb_to_hex(*original_rgb)}: {e}", level="WARNING")
             # Optionally, add a placeholder or skip this variation
-            # variations.append({"name": f"{name} (Error)", "hex": "#000000"})
+            # variations.append((f"{name} (Error)", "#000000"))
             
-    return variations 
\ No newline at end of file
+    return tuple(variations)
\ No newline at end of file
@@ -1,6 +1,7 @@
-import random
-import string
+import base64
+import os
 
 def generate_random_suffix(length: int = 8) -> str:
     """Generates a random alphanumeric suffix of a given length."""
-    return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length)) 
\ No newline at end of file
+    # One urandom read + C base32 (a-z, 2-7; 5 bits per char) instead of a per-char Python loop
+    return base64.b32encode(os.urandom((length * 5 + 7) // 8))[:length].decode('ascii').lower()
@@ -3,7 +3,12 @@ Utility functions for handling ID conversions and extractions.
 """
 import re
 from typing import Optional
-from .logger import log, error
+from .logger import debug
+
+# Leading padded ID followed by at least two more whitespace-separated parts ("000000057 FE F")
+_EXTENDED_ID_PREFIX_RE = re.compile(r'\s*(\d+)(?:\s+\S+){2,}\s*')
+# Pattern: 9 digits, space, "FE", space, "F"
+_EXTENDED_ID_FORMAT_RE = re.compile(r'^\d{9} FE F$')
 
 def extract_id_from_extended_id(extended_id: str) -> Optional[int]:
     """
@@ -28,28 +33,17 @@ def extract_id_from_extended_id(extended_id: str) -> Optional[int]:
     if not extended_id or not isinstance(extended_id, str):
         return None
     
-    try:
-        # Split by space and take the first part (the padded ID)
-        parts = extended_id.strip().split()
-        if len(parts) < 3:  # Should have at least "XXXXXXXXX FE F"
-            return None
-            
-        padded_id = parts[0]
-        
-        # Validate it's all digits
-        if not padded_id.isdigit():
-            return None
-            
-        # Convert to int (this will remove leading zeros)
-        db_id = int(padded_id)
-        
-        log(f"Extracted ID {db_id} from extended_id '{extended_id}'")
-        return db_id
-        
-    except (ValueError, IndexError) as e:
-        error(f"Failed to extract ID from extended_id '{extended_id}': {str(e)}")
+    # One pass: the match both validates the shape and captures the padded ID
+    match = _EXTENDED_ID_PREFIX_RE.fullmatch(extended_id)
+    if not match:
         return None
 
+    # Convert to int (this will remove leading zeros)
+    db_id = int(match.group(1))
+
+    debug(f"Extracted ID {db_id} from extended_id '{extended_id}'")
+    return db_id
+
 def validate_extended_id_format(extended_id: str) -> bool:
     """
     Validate that an extended_id follows the expected format.
@@ -63,9 +57,7 @@ def validate_extended_id_format(extended_id: str) -> bool:
     if not extended_id or not isinstance(extended_id, str):
         return False
     
-    # Pattern: 9 digits, space, "FE", space, "F"
-    pattern = r'^\d{9} FE F$'
-    return bool(re.match(pattern, extended_id.strip()))
+    return bool(_EXTENDED_ID_FORMAT_RE.match(extended_id.strip()))
 
 def create_extended_id(db_id: int, padding_length: int = 9, suffix: str = "FE F") -> str:
     """
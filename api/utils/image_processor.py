@@ -1,7 +1,7 @@
 """
 Utilities for processing and preparing images for AI processing.
 """
-import base64
+import pybase64
 import io
 from typing import Optional, Tuple
 from PIL import Image
@@ -46,7 +46,7 @@ class ImageProcessor:
             header, encoded = image_data_url.split(';base64,', 1)
             debug(f"Image format from header: {header}", request_id=request_id)
             
-            image_data = base64.b64decode(encoded)
+            image_data = pybase64.b64decode(encoded)
             debug(f"Successfully decoded base64 data, size: {len(image_data) / 1024:.2f} KB", request_id=request_id)
             
             return header, image_data
@@ -133,70 +133,97 @@ class ImageProcessor:
             log(f"Error converting image to RGB: {str(e)}", level="ERROR", request_id=request_id)
             raise ValueError(f"Failed to convert image to RGB: {str(e)}")
 
-def resize_and_convert_image_for_openai(image_data_url: str, request_id: Optional[str] = None) -> str:
+def resize_image_bytes_for_openai(image_data: bytes, request_id: Optional[str] = None) -> bytes:
     """
-    Resizes and converts an image data URL to 512x512 JPG format for optimal use with OpenAI API.
+    Resizes and converts raw image bytes to 512x512 JPG bytes for the OpenAI API.
     
     Parameters:
     -----------
-    image_data_url : str
-        The original image as a data URL (base64 encoded)
+    image_data : bytes
+        The original encoded image (PNG, JPEG, ...)
     request_id : str, optional
         A unique identifier for logging and tracking the request
         
     Returns:
     --------
-    str
-        A new data URL containing the resized and converted image
+    bytes
+        The resized image encoded as JPEG
         
     Raises:
     -------
     ValueError:
         If the image cannot be processed
     """
+    # Open the image
     try:
-        log(f"Starting image resize and conversion for OpenAI API", request_id=request_id)
-        
-        # Decode the data URL
-        _, image_data = ImageProcessor.decode_image_data_url(image_data_url, request_id)
-        
-        # Open the image
-        try:
-            img_buffer = io.BytesIO(image_data)
-            img = Image.open(img_buffer)
-            debug(f"Successfully opened image. Format: {img.format}, Mode: {img.mode}, Size: {img.size}", request_id=request_id)
-        except Exception as e:
-            log(f"Error opening image data: {str(e)}", level="ERROR", request_id=request_id)
-            raise ValueError(f"Failed to open image data: {str(e)}")
-        
-        # Create a perfect square image
-        img = ImageProcessor.create_square_image(img, request_id)
+        img_buffer = io.BytesIO(image_data)
+        img = Image.open(img_buffer)
+        # JPEG only (no-op otherwise): let libjpeg scale by 1/2..1/8 while decoding, keeping
+        # both sides >= 2x the target so the square crop still has enough pixels to downsample
+        img.draft('RGB', (IMAGE_SIZE[0] * 2, IMAGE_SIZE[1] * 2))
+        debug(f"Successfully opened image. Format: {img.format}, Mode: {img.mode}, Size: {img.size}", request_id=request_id)
+    except Exception as e:
+        log(f"Error opening image data: {str(e)}", level="ERROR", request_id=request_id)
+        raise ValueError(f"Failed to open image data: {str(e)}")
+    
+    # Create a perfect square image
+    img = ImageProcessor.create_square_image(img, request_id)
+    
+    # Ensure RGB mode
+    img = ImageProcessor.ensure_rgb_mode(img, request_id)
+    
+    # Resize to target size
+    try:
+        debug(f"Resizing image from {img.size} to {IMAGE_SIZE} for OpenAI", request_id=request_id)
+        # reducing_gap: box-reduce in C down to ~2x the target first (area-style averaging),
+        # so LANCZOS only runs over a few times the output pixels
+        img = img.resize(IMAGE_SIZE, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        debug(f"Successfully resized image to {img.size}", request_id=request_id)
+    except Exception as e:
+        log(f"Error resizing image: {str(e)}", level="ERROR", request_id=request_id)
+        raise ValueError(f"Failed to resize image: {str(e)}")
+    
+    # Save as JPG to buffer
+    try:
+        output_buffer = io.BytesIO()
+        img.save(output_buffer, format="JPEG", quality=JPG_QUALITY)
+        debug(f"Successfully saved image as JPEG", request_id=request_id)
+    except Exception as e:
+        log(f"Error saving image as JPEG: {str(e)}", level="ERROR", request_id=request_id)
+        raise ValueError(f"Failed to save image as JPEG: {str(e)}")
+    
+    return output_buffer.getvalue()
+
+def resize_image_bytes_to_openai_data_url(image_data: bytes, request_id: Optional[str] = None) -> str:
+    """
+    Resizes and converts raw image bytes to a 512x512 JPG data URL for the OpenAI API.
+    
+    Parameters:
+    -----------
+    image_data : bytes
+        The original encoded image (PNG, JPEG, ...), e.g. the raw upload
+    request_id : str, optional
+        A unique identifier for logging and tracking the request
         
-        # Ensure RGB mode
-        img = ImageProcessor.ensure_rgb_mode(img, request_id)
+    Returns:
+    --------
+    str
+        A data URL containing the resized and converted image
         
-        # Resize to target size
-        try:
-            debug(f"Resizing image from {img.size} to {IMAGE_SIZE} for OpenAI", request_id=request_id)
-            img = img.resize(IMAGE_SIZE, Image.Resampling.LANCZOS)
-            debug(f"Successfully resized image to {img.size}", request_id=request_id)
-        except Exception as e:
-            log(f"Error resizing image: {str(e)}", level="ERROR", request_id=request_id)
-            raise ValueError(f"Failed to resize image: {str(e)}")
+    Raises:
+    -------
+    ValueError:
+        If the image cannot be processed
+    """
+    try:
+        log(f"Starting image resize and conversion for OpenAI API", request_id=request_id)
         
-        # Save as JPG to buffer
-        try:
-            output_buffer = io.BytesIO()
-            img.save(output_buffer, format="JPEG", quality=JPG_QUALITY)
-            output_buffer.seek(0)
-            debug(f"Successfully saved image as JPEG", request_id=request_id)
-        except Exception as e:
-            log(f"Error saving image as JPEG: {str(e)}", level="ERROR", request_id=request_id)
-            raise ValueError(f"Failed to save image as JPEG: {str(e)}")
+        # Resize on the raw bytes; only the small JPEG result is base64-encoded
+        jpg_bytes = resize_image_bytes_for_openai(image_data, request_id)
         
         # Encode as base64
         try:
-            jpg_base64 = base64.b64encode(output_buffer.read()).decode('utf-8')
+            jpg_base64 = pybase64.b64encode(jpg_bytes).decode('utf-8')
             debug(f"Successfully encoded image as base64, length: {len(jpg_base64) // 1024} KB", request_id=request_id)
         except Exception as e:
             log(f"Error encoding image to base64: {str(e)}", level="ERROR", request_id=request_id)
@@ -206,8 +233,8 @@ def resize_and_convert_image_for_openai(image_data_url: str, request_id: Optiona
         resized_data_url = f"data:image/jpeg;base64,{jpg_base64}"
         
         # Calculate size reduction
-        original_size = len(image_data_url) / 1024
-        new_size = len(resized_data_url) / 1024
+        original_size = len(image_data) / 1024
+        new_size = len(jpg_bytes) / 1024
         log(f"Image resized for OpenAI API: {original_size:.2f}KB -> {new_size:.2f}KB", request_id=request_id)
         
         return resized_data_url
@@ -215,4 +242,32 @@ def resize_and_convert_image_for_openai(image_data_url: str, request_id: Optiona
     except Exception as e:
         log(f"Unexpected error resizing image for OpenAI: {str(e)}", level="ERROR", request_id=request_id)
         # Re-raise with clear message
-        raise ValueError(f"Failed to resize image for OpenAI: {str(e)}") 
\ No newline at end of file
+        raise ValueError(f"Failed to resize image for OpenAI: {str(e)}")
+
+def resize_and_convert_image_for_openai(image_data_url: str, request_id: Optional[str] = None) -> str:
+    """
+    Resizes and converts an image data URL to 512x512 JPG format for optimal use with OpenAI API.
+    Callers holding the raw image bytes should use resize_image_bytes_to_openai_data_url.
+    
+    Parameters:
+    -----------
+    image_data_url : str
+        The original image as a data URL (base64 encoded)
+    request_id : str, optional
+        A unique identifier for logging and tracking the request
+        
+    Returns:
+    --------
+    str
+        A new data URL containing the resized and converted image
+        
+    Raises:
+    -------
+    ValueError:
+        If the image cannot be processed
+    """
+    try:
+        _, image_data = ImageProcessor.decode_image_data_url(image_data_url, request_id)
+    except ValueError as e:
+        raise ValueError(f"Failed to resize image for OpenAI: {str(e)}")
+    return resize_image_bytes_to_openai_data_url(image_data, request_id)
@@ -24,22 +24,33 @@ logger.propagate = False
 
 # Add custom request_id filter
 class RequestIdFilter(logging.Filter):
-    def __init__(self, request_id=None):
-        super().__init__()
-        self.request_id = request_id
-    
     def filter(self, record):
-        record.request_id = self.request_id if hasattr(self, 'request_id') and self.request_id else None
+        # request_id arrives per record via `extra`; default it for records logged without one
+        record.request_id = getattr(record, 'request_id', None)
         return True
 
 # Custom formatter that only displays request_id when it exists
 class CustomFormatter(logging.Formatter):
-    def format(self, record):
-        if hasattr(record, 'request_id') and record.request_id:
-            self._style._fmt = '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s'
-        else:
-            self._style._fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        return super().format(record)
+    _request_id_style = logging.PercentStyle('%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s')
+    _sec_cache = (None, "")  # (epoch second, formatted date part) for formatTime
+
+    def formatTime(self, record, datefmt=None):
+        # strftime dominates the default formatTime but only changes once a second,
+        # so reuse the date part and just append the milliseconds
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        sec = int(record.created)
+        cached_sec, sec_str = self._sec_cache
+        if sec != cached_sec:
+            sec_str = time.strftime(self.default_time_format, self.converter(sec))
+            self._sec_cache = (sec, sec_str)  # One tuple so concurrent threads never see a mixed pair
+        return self.default_msec_format % (sec_str, record.msecs)
+
+    def formatMessage(self, record):
+        # Pick the style per record instead of rewriting the shared one, which raced across threads
+        if getattr(record, 'request_id', None):
+            return self._request_id_style.format(record)
+        return super().formatMessage(record)
 
 # Add a console handler to ensure logs appear in the terminal
 console_handler = logging.StreamHandler(sys.stdout)
@@ -49,6 +60,14 @@ console_handler.setFormatter(formatter)
 logger.addHandler(console_handler)
 logger.addFilter(RequestIdFilter())
 
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
 def log(message, level="INFO", request_id=None, flush=True):
     """
     Log a message using Python's logging module.
@@ -62,34 +81,15 @@ def log(message, level="INFO", request_id=None, flush=True):
     request_id : str, optional
         A unique identifier for tracking the request across log messages
     flush : bool
-        Whether to flush the stdout buffer immediately (ignored with logging module)
+        Kept for compatibility; the stream handler flushes after every record anyway
     """
-    if request_id:
-        # Update the filter with the request_id
-        for handler in logger.handlers:
-            for filter in handler.filters:
-                if isinstance(filter, RequestIdFilter):
-                    filter.request_id = request_id
-    
-    level_upper = level.upper()
-    if level_upper == "DEBUG":
-        logger.debug(message)
-    elif level_upper == "INFO":
-        logger.info(message)
-    elif level_upper == "WARNING":
-        logger.warning(message)
-    elif level_upper == "ERROR":
-        logger.error(message)
-    elif level_upper == "CRITICAL":
-        logger.critical(message)
-    else:
-        logger.info(message)
-    
-    if flush:
-        for handler in logger.handlers:
-            handler.flush()
+    logger.log(_LEVELS.get(level.upper(), logging.INFO), message, extra={'request_id': request_id} if request_id else None)
+    # No explicit flush: StreamHandler.emit already flushes after every record
 
 def debug(message, request_id=None):
+    # Debug lines are the bulk of render logging; skip the dispatch when the level filters them out
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     log(message, level="DEBUG", request_id=request_id)
 
 def info(message, request_id=None):
@@ -189,7 +189,7 @@ class A4Layout:
         # Convert RGBA to RGB if needed (for TIFF compatibility)
         if final_card.mode == 'RGBA':
             rgb_image = Image.new('RGB', final_card.size, 'white')
-            rgb_image.paste(final_card, mask=final_card.split()[-1])
+            rgb_image.paste(final_card, mask=final_card.getchannel("A"))
             final_card = rgb_image
         
         # STEP 5: Place final card on A4 canvas
@@ -422,7 +422,7 @@ class A4Layout:
             self.canvas.save(
                 img_byte_arr, 
                 format='TIFF',
-                compression='lzw',  # Lossless compression
+                compression='tiff_lzw',  # Lossless compression
                 dpi=(PRINT_DPI, PRINT_DPI),  # 300 DPI metadata
                 icc_profile=ImageCms.ImageCmsProfile(srgb_profile).tobytes() # Embed sRGB profile for color consistency
             )